@@ -0,0 +1,15 @@
+import pytest
+
+from extractous import Extractor
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    """An Extractor with default configuration, shared by all tests of a module."""
+    return Extractor()
+
+
+@pytest.fixture(scope="session")
+def extract_cache_dir(pytestconfig):
+    """Directory of the on-disk extraction cache, kept across test runs."""
+    return str(pytestconfig.cache.mkdir("extract"))
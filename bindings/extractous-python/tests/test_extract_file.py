@@ -2,7 +2,8 @@ import json
 import pytest
 
 from extractous import Extractor
-from utils import calculate_similarity_percent, cosine_similarity, is_expected_metadata_contained, read_to_string, extract_body_text
+from utils import calculate_similarity_percent, cosine_similarity, is_expected_metadata_contained, read_to_string, extract_body_text, \
+    cached_extract_file_to_string
 
 TEST_CASES = [
     ("2022_Q3_AAPL.pdf", 0.9, 0.8),
@@ -20,7 +21,7 @@ TEST_CASES = [
 ]
 
 @pytest.mark.parametrize("file_name, target_dist, metadata_dist", TEST_CASES)
-def test_extract_file_to_string(file_name, target_dist, metadata_dist):
+def test_extract_file_to_string(file_name, target_dist, metadata_dist, extract_cache_dir):
     """Test the extraction to string as plain text of various file types."""
     original_filepath = f"../../test_files/documents/{file_name}"
     expected_result_filepath = f"../../test_files/expected_result/{file_name}.txt"
@@ -34,7 +35,7 @@ def test_extract_file_to_string(file_name, target_dist, metadata_dist):
 
     # Extract
     extractor = Extractor()
-    result, metadata = extractor.extract_file_to_string(original_filepath)
+    result, metadata = cached_extract_file_to_string(extractor, original_filepath, extract_cache_dir)
 
     # Check extracted
     assert cosine_similarity(result, expected) >= target_dist, \
@@ -50,7 +51,7 @@ def test_extract_file_to_string(file_name, target_dist, metadata_dist):
         f"The metadata similarity is lower than expected. Current {percent_similarity}% | filename: {file_name}"
 
 @pytest.mark.parametrize("file_name, target_dist, metadata_dist", TEST_CASES)
-def test_extract_file_to_string_as_xml(file_name, target_dist, metadata_dist):
+def test_extract_file_to_string_as_xml(file_name, target_dist, metadata_dist, extract_cache_dir):
     """Test the extraction to string as XML of various file types."""
     original_filepath = f"../../test_files/documents/{file_name}"
     expected_result_filepath = f"../../test_files/expected_result/{file_name}.txt"
@@ -65,7 +66,7 @@ def test_extract_file_to_string_as_xml(file_name, target_dist, metadata_dist):
     # Extract
     extractor = Extractor()
     extractor = extractor.set_xml_output(True)
-    result_xml, metadata = extractor.extract_file_to_string(original_filepath)
+    result_xml, metadata = cached_extract_file_to_string(extractor, original_filepath, extract_cache_dir)
     result_text = extract_body_text(result_xml)
 
     # Check extracted
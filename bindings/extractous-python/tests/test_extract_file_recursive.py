@@ -1,23 +1,57 @@
+import functools
+import hashlib
+import multiprocessing
 import pytest
 import os
+from concurrent.futures import ProcessPoolExecutor
 
 from extractous import Extractor
 from utils import read_file_to_bytearray
 
-# 根据当前工作目录确定测试文件路径
-if os.path.exists("test_files/documents"):
-    TEST_FILES_BASE = "test_files/documents"
-else:
-    TEST_FILES_BASE = "../../test_files/documents"
+
+# 根据当前工作目录确定测试文件路径,首次调用时才检查
+@functools.lru_cache(maxsize=None)
+def _base():
+    if os.path.isdir("test_files/documents"):
+        return "test_files/documents"
+    return "../../test_files/documents"
+
+
+# 按文件内容 SHA-256、提取器配置和选项缓存递归提取结果,避免重复提取同一文件
+_CACHE = {}
+
+
+def _extract(extractor, file_path, **opts):
+    """递归提取文件,相同内容和选项只提取一次"""
+    with open(file_path, "rb") as f:
+        digest = hashlib.sha256(f.read()).hexdigest()
+    key = (digest, repr(extractor), tuple(sorted(opts.items())))
+    if key not in _CACHE:
+        if opts:
+            _CACHE[key] = extractor.extract_file_recursive_opt(file_path, **opts)
+        else:
+            _CACHE[key] = extractor.extract_file_recursive(file_path)
+    return _CACHE[key]
+
+
+def _extract_one(file_path):
+    """在工作进程中用独立的提取器递归提取文件,只返回可序列化的结果摘要"""
+    result = Extractor().extract_file_recursive(file_path)
+    return result.total_count, result.container() is not None
+
+
+@pytest.fixture
+def limited_extractor(extractor):
+    """限制提取字符串长度的提取器,由模块共享的提取器派生"""
+    return extractor.set_extract_string_max_length(10000)
 
 
 class TestExtractFileRecursive:
     """测试 extract_file_recursive 递归提取功能"""
 
-    def test_extract_file_recursive_basic(self):
+    def test_extract_file_recursive_basic(self, extractor):
         """测试基本的递归提取功能"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/category-level.docx")
+        result = _extract(extractor, f"{_base()}/category-level.docx")
 
         assert result is not None
         assert result.total_count >= 1
@@ -27,10 +61,9 @@ class TestExtractFileRecursive:
         assert len(container.content) > 0
         assert len(container.metadata) > 0
 
-    def test_extract_file_recursive_with_pdf(self):
+    def test_extract_file_recursive_with_pdf(self, extractor):
         """测试 PDF 文件的递归提取"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/2022_Q3_AAPL.pdf")
+        result = _extract(extractor, f"{_base()}/2022_Q3_AAPL.pdf")
 
         assert result.total_count >= 1
 
@@ -38,10 +71,9 @@ class TestExtractFileRecursive:
         assert container is not None
         assert "Apple" in container.content or "AAPL" in container.content
 
-    def test_extract_file_recursive_documents_list(self):
+    def test_extract_file_recursive_documents_list(self, extractor):
         """测试文档列表访问"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/simple.odt")
+        result = _extract(extractor, f"{_base()}/simple.odt")
 
         documents = result.documents
         assert len(documents) >= 1
@@ -53,21 +85,20 @@ class TestExtractFileRecursive:
             assert isinstance(doc.content, str)
             assert isinstance(doc.metadata, dict)
 
-    def test_extract_file_recursive_embedded_documents(self):
+    def test_extract_file_recursive_embedded_documents(self, extractor):
         """测试嵌入文档访问"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/simple.pptx")
+        result = _extract(extractor, f"{_base()}/simple.pptx")
 
         embedded = result.embedded_documents()
         assert isinstance(embedded, list)
         assert len(embedded) == result.total_count - 1
 
-    def test_extract_file_recursive_with_max_length(self):
+    def test_extract_file_recursive_with_max_length(self, extractor):
         """测试带最大长度限制的递归提取"""
         max_length = 5000
-        extractor = Extractor()
-        result = extractor.extract_file_recursive_opt(
-            f"{TEST_FILES_BASE}/2022_Q3_AAPL.pdf",
+        result = _extract(
+            extractor,
+            f"{_base()}/2022_Q3_AAPL.pdf",
             max_length=max_length
         )
 
@@ -77,11 +108,11 @@ class TestExtractFileRecursive:
             assert len(doc.content) <= max_length, \
                 f"文档内容长度 {len(doc.content)} 超过限制 {max_length}"
 
-    def test_extract_file_recursive_as_xml(self):
+    def test_extract_file_recursive_as_xml(self, extractor):
         """测试以 XML 格式递归提取"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive_opt(
-            f"{TEST_FILES_BASE}/simple.odt",
+        result = _extract(
+            extractor,
+            f"{_base()}/simple.odt",
             as_xml=True
         )
 
@@ -91,12 +122,12 @@ class TestExtractFileRecursive:
         assert container is not None
         assert "<" in container.content and ">" in container.content
 
-    def test_extract_file_recursive_with_options(self):
+    def test_extract_file_recursive_with_options(self, extractor):
         """测试同时使用 max_length 和 as_xml 选项"""
         max_length = 5000
-        extractor = Extractor()
-        result = extractor.extract_file_recursive_opt(
-            f"{TEST_FILES_BASE}/category-level.docx",
+        result = _extract(
+            extractor,
+            f"{_base()}/category-level.docx",
             max_length=max_length,
             as_xml=True
         )
@@ -108,10 +139,9 @@ class TestExtractFileRecursive:
             assert len(doc.content) <= max_length + 1000
             assert "<" in doc.content and ">" in doc.content
 
-    def test_extract_file_recursive_metadata(self):
+    def test_extract_file_recursive_metadata(self, extractor):
         """测试元数据提取"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/vodafone.xlsx")
+        result = _extract(extractor, f"{_base()}/vodafone.xlsx")
 
         container = result.container()
         assert container is not None
@@ -123,25 +153,26 @@ class TestExtractFileRecursive:
     def test_extract_file_recursive_multiple_documents(self):
         """测试多文档处理"""
         test_files = [
-            f"{TEST_FILES_BASE}/simple.odt",
-            f"{TEST_FILES_BASE}/simple.pptx",
-            f"{TEST_FILES_BASE}/vodafone.xlsx",
+            f"{_base()}/simple.odt",
+            f"{_base()}/simple.pptx",
+            f"{_base()}/vodafone.xlsx",
         ]
 
-        extractor = Extractor()
-        for file_path in test_files:
-            result = extractor.extract_file_recursive(file_path)
-            assert result.total_count >= 1
-            assert result.container() is not None
+        # 每个文件在独立进程中提取;使用 spawn 避免 fork 已初始化的原生运行时
+        with ProcessPoolExecutor(
+            max_workers=min(len(test_files), os.cpu_count() or 1),
+            mp_context=multiprocessing.get_context("spawn"),
+        ) as pool:
+            for file_path, (total_count, has_container) in zip(test_files, pool.map(_extract_one, test_files)):
+                assert total_count >= 1, f"{file_path} 没有提取到文档"
+                assert has_container, f"{file_path} 没有容器文档"
 
-    def test_extract_file_recursive_error_handling(self):
+    def test_extract_file_recursive_error_handling(self, extractor):
         """测试错误处理"""
-        extractor = Extractor()
-
         with pytest.raises(Exception):
             extractor.extract_file_recursive("nonexistent_file.txt")
 
-    def test_extract_file_recursive_empty_file(self):
+    def test_extract_file_recursive_empty_file(self, extractor):
         """测试空文件会抛出异常"""
         import tempfile
         import os
@@ -151,17 +182,15 @@ class TestExtractFileRecursive:
             f.write("")
 
         try:
-            extractor = Extractor()
             with pytest.raises(Exception) as exc_info:
                 extractor.extract_file_recursive(temp_file)
             assert "InputStream must have > 0 bytes" in str(exc_info.value)
         finally:
             os.unlink(temp_file)
 
-    def test_extract_file_recursive_container_is_first_document(self):
+    def test_extract_file_recursive_container_is_first_document(self, extractor):
         """验证 container() 返回的是第一个文档"""
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/simple.doc")
+        result = _extract(extractor, f"{_base()}/simple.doc")
 
         container = result.container()
         documents = result.documents
@@ -181,22 +210,18 @@ class TestExtractFileRecursive:
         "simple.pptx",
         "winter-sports.epub",
     ])
-    def test_extract_file_recursive_various_formats(self, file_name):
+    def test_extract_file_recursive_various_formats(self, extractor, file_name):
         """测试各种文件格式的递归提取"""
-        file_path = f"{TEST_FILES_BASE}/{file_name}"
-        extractor = Extractor()
-        result = extractor.extract_file_recursive(file_path)
+        file_path = f"{_base()}/{file_name}"
+        result = _extract(extractor, file_path)
 
         assert result.total_count >= 1
         assert result.container() is not None
         assert len(result.container().content) > 0
 
-    def test_extract_file_recursive_with_extractor_config(self):
+    def test_extract_file_recursive_with_extractor_config(self, limited_extractor):
         """测试使用配置的提取器进行递归提取"""
-        extractor = Extractor()
-        extractor = extractor.set_extract_string_max_length(10000)
-
-        result = extractor.extract_file_recursive(f"{TEST_FILES_BASE}/2022_Q3_AAPL.pdf")
+        result = _extract(limited_extractor, f"{_base()}/2022_Q3_AAPL.pdf")
 
         assert result.total_count >= 1
         for doc in result.documents:
@@ -0,0 +1,84 @@
+import io
+
+import numpy as np
+import pytest
+
+from utils import _cosine_np, _get_cosine_kernel, cosine_similarity, cosine_similarity_batch, \
+    read_file_to_bytearray, read_file_to_mmap, read_to_string
+
+
+@pytest.mark.parametrize("a, b", [
+    ([1.0, 2.0, 0.0, 3.0], [2.0, 0.0, 1.0, 3.0]),
+    ([1.0, 1.0, 1.0], [1.0, 1.0, 1.0]),
+    ([0.0, 5.0], [7.0, 0.0]),
+    ([0.0, 0.0], [1.0, 2.0]),
+])
+def test_cosine_kernels_agree(a, b):
+    """The Numba kernel must give the same result as the NumPy fallback."""
+    pytest.importorskip("numba")
+    a = np.asarray(a, dtype=np.float64)
+    b = np.asarray(b, dtype=np.float64)
+
+    assert _get_cosine_kernel()(a, b) == pytest.approx(_cosine_np(a, b))
+
+
+def test_cosine_similarity_batch_matches_pairwise():
+    """Every cell of the batch matrix must equal the pairwise cosine similarity."""
+    texts_a = ["Hello World hello", "", "the quick brown fox", "Apple reports Q3 results", "one two three"]
+    texts_b = ["hello there world", "the quick brown fox", "", "apple results", "one two three"]
+
+    result = cosine_similarity_batch(texts_a, texts_b)
+
+    assert result.shape == (len(texts_a), len(texts_b))
+    for i, text_a in enumerate(texts_a):
+        for j, text_b in enumerate(texts_b):
+            assert result[i, j] == pytest.approx(cosine_similarity(text_a, text_b))
+    assert result[2, 1] == pytest.approx(1.0)
+    assert result[4, 4] == pytest.approx(1.0)
+    assert result.max() <= 1.0
+
+
+@pytest.mark.parametrize("text", [
+    "one two three",
+    "one two three four five",
+    "one two three four five six seven",
+])
+def test_cosine_similarity_batch_identical_texts(text):
+    """Identical texts score 1.0 up to rounding, never above it."""
+    result = cosine_similarity_batch([text], [text])
+
+    assert result[0, 0] == pytest.approx(1.0)
+    assert result[0, 0] <= 1.0
+
+
+@pytest.mark.parametrize("file_name", ["simple.doc", "2022_Q3_AAPL.pdf"])
+def test_read_file_to_mmap_matches_bytearray(file_name):
+    """The mapped file must expose the same bytes as read_file_to_bytearray."""
+    file_path = f"../../test_files/documents/{file_name}"
+
+    mapped = read_file_to_mmap(file_path)
+    try:
+        assert mapped[:] == read_file_to_bytearray(file_path)
+    finally:
+        mapped.close()
+
+
+def test_read_file_to_mmap_empty_file(tmp_path):
+    """Empty files cannot be mapped, so they read as empty bytes."""
+    empty_file = tmp_path / "empty.bin"
+    empty_file.write_bytes(b"")
+
+    assert read_file_to_mmap(str(empty_file)) == b""
+    assert read_file_to_bytearray(str(empty_file)) == bytearray()
+
+
+def test_read_to_string_bytes_io_from_current_position():
+    """In-memory readers are decoded from their current position up to EOF."""
+    data = "héllo wörld ✓ 中文".encode("utf-8")
+    reader = io.BytesIO(data)
+    # Consume "hé", the second character being a two-byte sequence
+    reader.read(3)
+
+    assert read_to_string(reader) == "llo wörld ✓ 中文"
+    assert reader.tell() == len(data)
+    assert reader.read() == b""